@@ -23,6 +23,7 @@ from .util import (
     hash_file,
     json_safe_load,
     json_safe_loads,
+    json_save,
     load_pm_signature,
     make_temp_directory,
     name_cleaner,
@@ -33,6 +34,7 @@ from .util import (
     )
 
 from .info import (
+    port_info_empty,
     port_info_load,
     port_info_merge,
     )
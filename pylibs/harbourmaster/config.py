@@ -24,25 +24,29 @@ HM_PERFTEST=False
 
 ################################################################################
 ## The following code is a simplification of the PortMaster toolsloc and whichsd code.
-HM_DEFAULT_PORTS_DIR = Path("/roms/ports")
+## This runs on every start, so use os.path and only make a Path for the result.
+HM_DEFAULT_PORTS_DIR = "/roms/ports"
 
 if platform.system() in ('Darwin', 'Windows'):
     ## For testing
     HM_DEFAULT_TOOLS_DIR = Path('.').absolute()
     HM_DEFAULT_PORTS_DIR = Path('ports/').absolute()
     HM_TESTING=True
-elif Path("/opt/tools/PortMaster/").is_dir():
-    HM_DEFAULT_TOOLS_DIR = Path("/opt/tools")
-elif Path("/opt/system/Tools/PortMaster/").is_dir():
-    HM_DEFAULT_TOOLS_DIR = Path("/opt/system/Tools")
-elif Path("/storage/roms/ports").is_dir():
-    HM_DEFAULT_TOOLS_DIR = Path("/storage/roms/ports")
-    HM_DEFAULT_PORTS_DIR = Path("/storage/roms/ports")
+elif os.path.isdir("/opt/tools/PortMaster/"):
+    HM_DEFAULT_TOOLS_DIR = "/opt/tools"
+elif os.path.isdir("/opt/system/Tools/PortMaster/"):
+    HM_DEFAULT_TOOLS_DIR = "/opt/system/Tools"
+elif os.path.isdir("/storage/roms/ports"):
+    HM_DEFAULT_TOOLS_DIR = "/storage/roms/ports"
+    HM_DEFAULT_PORTS_DIR = "/storage/roms/ports"
 else:
-    HM_DEFAULT_TOOLS_DIR = Path("/roms/ports")
+    HM_DEFAULT_TOOLS_DIR = "/roms/ports"
 
-if Path("/roms2/ports").is_dir():
-    HM_DEFAULT_PORTS_DIR = Path("/roms2/ports")
+if os.path.isdir("/roms2/ports"):
+    HM_DEFAULT_PORTS_DIR = "/roms2/ports"
+
+HM_DEFAULT_TOOLS_DIR = Path(HM_DEFAULT_TOOLS_DIR)
+HM_DEFAULT_PORTS_DIR = Path(HM_DEFAULT_PORTS_DIR)
 
 ## Default TOOLS_DIR
 if HM_TOOLS_DIR is None:
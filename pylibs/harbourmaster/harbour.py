@@ -1,7 +1,7 @@
 
 # System imports
 import fnmatch
-import json
+import os
 import pathlib
 import shutil
 import subprocess
@@ -33,6 +33,8 @@ class HarbourMaster():
         'first_run': True,
         }
 
+    SOURCE_REQUIRED_KEYS = frozenset(('version', 'prefix', 'api', 'name', 'last_checked', 'data'))
+
     def __init__(self, config, *, tools_dir=None, ports_dir=None, temp_dir=None, callback=None):
         """
         config = load_config()
@@ -92,30 +94,28 @@ class HarbourMaster():
 
     @timeit
     def load_sources(self):
-        source_files = list(self.cfg_dir.glob('*.source.json'))
-        source_files.sort()
+        with os.scandir(self.cfg_dir) as it:
+            source_names = [
+                entry.name
+                for entry in it
+                if entry.name.endswith('.source.json') and entry.is_file()]
 
-        check_keys = {'version': None, 'prefix': None, 'api': HM_SOURCE_APIS, 'name': None, 'last_checked': None, 'data': None}
-        for source_file in source_files:
-            with source_file.open() as fh:
-                source_data = json_safe_load(fh)
+        source_names.sort()
 
-            if source_data is None:
-                continue
+        for source_name in source_names:
+            source_file = self.cfg_dir / source_name
+            source_data = json_safe_loads(source_file.read_bytes())
 
-            fail = False
-            for check_key, check_value in check_keys.items():
-                if check_key not in source_data:
-                    logger.error(f"Missing key {check_key!r} in {source_file}.")
-                    fail = True
-                    break
+            if not isinstance(source_data, dict):
+                continue
 
-                if check_value is not None and source_data[check_key] not in check_value:
-                    logger.error(f"Unknown {check_key!r} in {source_file}: {source_data[check_key]}.")
-                    fail = True
-                    break
+            missing_keys = self.SOURCE_REQUIRED_KEYS - source_data.keys()
+            if missing_keys:
+                logger.error(f"Missing keys {', '.join(sorted(missing_keys))} in {source_file}.")
+                continue
 
-            if fail:
+            if source_data['api'] not in HM_SOURCE_APIS:
+                logger.error(f"Unknown 'api' in {source_file}: {source_data['api']}.")
                 continue
 
             source = HM_SOURCE_APIS[source_data['api']](self, source_file, source_data)
@@ -425,10 +425,8 @@ class HarbourMaster():
 
             ## Load extra info
             for source in self.sources.values():
-                port_name = source.clean_name(port_info['name'])
-
-                if port_name in source.ports:
-                    port_info_merge(port_info, source.port_info(port_name))
+                if source.has_port(port_info['name']):
+                    port_info_merge(port_info, source.port_info(port_info['name']))
                     break
 
             if port_info['attr']['title'] in ("", None):
@@ -518,8 +516,7 @@ class HarbourMaster():
 
             if changed:
                 logger.debug(f"Dumping {str(ports_files[port_name])}: {port_info}")
-                with ports_files[port_name].open('wt') as fh:
-                    json.dump(port_info, fh, indent=4)
+                json_save(ports_files[port_name], port_info)
 
     def port_info_attrs(self, port_info):
         runtime_fix = {
@@ -721,7 +718,7 @@ class HarbourMaster():
         if port_info_file is not None:
             port_info = port_info_load(port_info_file)
         else:
-            port_info = port_info_load({})
+            port_info = port_info_empty()
 
         # print(f"Port Info: {port_info}")
         # print(f"Download Info: {download_info}")
@@ -760,8 +757,7 @@ class HarbourMaster():
                     add_pm_signature(self.ports_dir / item, [port_info['name'], item])
         # print(f"Merged Info: {port_info}")
 
-        with open(port_info_file, 'w') as fh:
-            json.dump(port_info, fh, indent=4)
+        json_save(port_info_file, port_info)
 
         self._fix_permissions()
 
@@ -833,7 +829,7 @@ class HarbourMaster():
             if not fnmatch.fnmatch(source_prefix, repo):
                 continue
 
-            if source.clean_name(port_name) not in source.ports:
+            if not source.has_port(port_name):
                 continue
 
             download_info = source.download(source.clean_name(port_name), callback=self.callback)
@@ -36,65 +36,89 @@ PORT_INFO_ATTR_ATTRS = {
     }
 
 
+def port_info_default(default):
+    """
+    Returns a fresh copy of a list/dict default, other defaults are returned as is.
+    """
+    if isinstance(default, (dict, list)):
+        return default.copy()
+
+    return default
+
+
+def port_info_empty():
+    """
+    Returns a new empty port_info built from PORT_INFO_ROOT_ATTRS and PORT_INFO_ATTR_ATTRS.
+    """
+    port_info = {
+        attr: port_info_default(attr_default)
+        for attr, attr_default in PORT_INFO_ROOT_ATTRS.items()}
+
+    port_info['attr'] = {
+        attr: port_info_default(attr_default)
+        for attr, attr_default in PORT_INFO_ATTR_ATTRS.items()}
+
+    return port_info
+
+
+def port_info_bad_item(item):
+    """
+    Items must be relative to the ports dir, and must not escape it.
+    """
+    return (
+        item == "" or
+        item.startswith('/') or
+        item.startswith('../') or
+        '/../' in item)
+
+
 @timeit
 def port_info_load(raw_info, source_name=None, do_default=False):
-    if isinstance(raw_info, pathlib.PurePath):
-        source_name = str(raw_info)
-
-        with raw_info.open('r') as fh:
-            info = json_safe_load(fh)
-            if info is None or not isinstance(info, dict):
-                if do_default:
-                    info = {}
-                else:
-                    return None
-
-    elif isinstance(raw_info, str):
-        if raw_info.strip().startswith('{') and raw_info.strip().endswith('}'):
-            if source_name is None:
-                source_name = "<str>"
+    """
+    Load port_info from a dict, a json str/bytes, or a file name/path.
+    """
+    info = None
 
-            info = json_safe_loads(info)
-            if info is None or not isinstance(info, dict):
-                if do_default:
-                    info = {}
-                else:
-                    return None
+    if isinstance(raw_info, dict):
+        info = raw_info
 
-        elif Path(raw_info).is_file():
-            source_name = raw_info
+    elif isinstance(raw_info, (str, bytes)) and not raw_info.strip():
+        # Nothing to load, fall through to the default.
+        pass
 
-            with open(rawinfo, 'r') as fh:
-                info = json_safe_load(fh)
-                if info is None or not isinstance(info, dict):
-                    if do_default:
-                        info = {}
-                    else:
-                        return None
+    else:
+        if isinstance(raw_info, str) and raw_info.lstrip()[0] not in '{[':
+            # Anything that isn't json must be a file name.
+            raw_info = pathlib.Path(raw_info)
 
-        else:
+        if isinstance(raw_info, pathlib.PurePath):
+            source_name = str(raw_info)
+
+            try:
+                data = raw_info.read_bytes()
+            except (OSError, ValueError) as err:
+                logger.error(f'Unable to load port_info from {source_name!r}: {err}')
+                data = None
+
+        elif isinstance(raw_info, (str, bytes)):
             if source_name is None:
                 source_name = "<str>"
 
-            logger.error(f'Unable to load port_info from {source_name!r}: {raw_inf!r}')
-            if do_default:
-                info = {}
-            else:
-                return None
+            data = raw_info
 
-    elif isinstance(raw_info, dict):
-        if source_name is None:
-            source_name = "<dict>"
+        else:
+            logger.error(f'Unable to load port_info from {source_name!r}: {raw_info!r}')
+            data = None
 
-        info = raw_info
+        if data is not None:
+            info = json_safe_loads(data)
 
-    else:
-        logger.error(f'Unable to load port_info from {source_name!r}: {raw_in!r}')
-        if do_default:
-            info = {}
-        else:
+    if not isinstance(info, dict):
+        if not do_default:
             return None
 
+        info = {}
+
     if info.get('version', None) == 1 or 'source' in info:
         # Update older json version to the newer one.
         info = info.copy()
@@ -119,81 +143,56 @@ def port_info_load(raw_info, source_name=None, do_default=False):
             key
             for key in info['attr']['reqs']]
 
-    # This strips out extra stuff
+    # This strips out extra stuff, list/dict defaults are only allocated when missing.
     port_info = {}
+    port_attr = {}
+    info_attr = info.get('attr', {})
 
     for attr, attr_default in PORT_INFO_ROOT_ATTRS.items():
-        if isinstance(attr_default, (dict, list)):
-            attr_default = attr_default.copy()
-
-        port_info[attr] = info.get(attr, attr_default)
+        if attr == 'attr':
+            port_info[attr] = port_attr
 
-    for attr, attr_default in PORT_INFO_ATTR_ATTRS.items():
-        if isinstance(attr_default, (dict, list)):
-            attr_default = attr_default.copy()
-
-        port_info['attr'][attr] = info.get('attr', {}).get(attr, attr_default)
-
-    if isinstance(port_info['items'], list):
-        i = 0
-        while i < len(port_info['items']):
-            item = port_info['items'][i]
-            if item.startswith('/'):
-                logger.error(f"port_info['items'] contains bad name {item!r}")
-                del port_info['items'][i]
-                continue
+        elif attr in info:
+            port_info[attr] = info[attr]
 
-            if item.startswith('../'):
-                logger.error(f"port_info['items'] contains bad name {item!r}")
-                del port_info['items'][i]
-                continue
-
-            if '/../' in item:
-                logger.error(f"port_info['items'] contains bad name {item!r}")
-                del port_info['items'][i]
-                continue
+        else:
+            port_info[attr] = port_info_default(attr_default)
 
-            if item == "":
-                logger.error(f"port_info['items'] contains bad name {item!r}")
-                del port_info['items'][i]
+    for attr, attr_default in PORT_INFO_ATTR_ATTRS.items():
+        value = info_attr.get(attr, attr_default)
 
-            i += 1
+        # A stored null for a list/dict attr gets the empty default instead.
+        if value is attr_default or (value is None and isinstance(attr_default, (dict, list))):
+            value = port_info_default(attr_default)
 
-    if isinstance(port_info['items_opt'], list):
-        i = 0
-        while i < len(port_info['items_opt']):
-            item = port_info['items_opt'][i]
-            if item.startswith('/'):
-                logger.error(f"port_info['items_opt'] contains bad name {item}")
-                del port_info['items_opt'][i]
-                continue
+        port_attr[attr] = value
 
-            if item.startswith('../'):
-                logger.error(f"port_info['items_opt'] contains bad name {item}")
-                del port_info['items_opt'][i]
-                continue
+    for key in ('items', 'items_opt'):
+        if not isinstance(port_info[key], list):
+            continue
 
-            if '/../' in item:
-                logger.error(f"port_info['items_opt'] contains bad name {item}")
-                del port_info['items_opt'][i]
+        items = []
+        for item in port_info[key]:
+            if port_info_bad_item(item):
+                logger.error(f"port_info[{key!r}] contains bad name {item!r}")
                 continue
 
-            if item == "":
-                logger.error(f"port_info['items'] contains bad name {item!r}")
-                del port_info['items_opt'][i]
+            items.append(item)
 
-            i += 1
+        port_info[key] = items
 
-        if port_info['items_opt'] == []:
-            port_info['items_opt'] = None
+    if port_info['items_opt'] == []:
+        port_info['items_opt'] = None
 
     if isinstance(port_info['attr'].get('genres', None), list):
-        genres = port_info['attr']['genres']
-        port_info['attr']['genres'] = []
+        genres = []
+
+        for genre in port_info['attr']['genres']:
+            genre = genre.casefold()
+            if genre in HM_GENRES:
+                genres.append(genre)
 
-        for genre in genres:
-            if genre.casefold() in HM_GENRES:
-                port_info['attr']['genres'].append(genre.casefold())
+        port_info['attr']['genres'] = genres
 
     return port_info
 
@@ -201,7 +200,7 @@ def port_info_load(raw_info, source_name=None, do_default=False):
 @timeit
 def port_info_merge(port_info, other):
     if isinstance(other, (str, pathlib.PurePath)):
-        other_info = port_info_parse(other)
+        other_info = port_info_load(other, do_default=True)
     elif isinstance(other, dict):
         other_info = other
     else:
@@ -259,6 +258,7 @@ def port_info_merge(port_info, other):
 
 
 __all__ = (
+    'port_info_empty',
     'port_info_load',
     'port_info_merge',
     )
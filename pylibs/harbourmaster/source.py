@@ -1,7 +1,6 @@
 
 # System imports
 import datetime
-import json
 import re
 import zipfile
 
@@ -18,6 +17,11 @@ from .config import *
 from .info import *
 from .util import *
 
+################################################################################
+## ports.md parsing
+PORTSMD_INFO_RE = re.compile(r'(?:^|\s)(\w+)="(.+?)"(?=\s+\w+=|$)')
+PORTSMD_SPACES_RE = re.compile(r'(?:%20|\.){2,}|%20')
+
 ################################################################################
 ## APIS
 class BaseSource():
@@ -26,6 +30,22 @@ class BaseSource():
     def __init__(self, hm, file_name, config):
         pass
 
+    def clean_name(self, text):
+        return name_cleaner(text)
+
+    def has_port(self, port_name):
+        """
+        Check if port_name is in self.ports, the lookup set is rebuilt whenever self.ports changes.
+        """
+        ports = getattr(self, 'ports', [])
+        ports_cache = getattr(self, '_ports_cache', None)
+
+        if ports_cache is None or ports_cache[0] is not ports or ports_cache[1] != len(ports):
+            ports_cache = (ports, len(ports), set(ports))
+            self._ports_cache = ports_cache
+
+        return self.clean_name(port_name) in ports_cache[2]
+
 
 class GitHubRawReleaseV1(BaseSource):
     VERSION = 3
@@ -78,11 +98,7 @@ class GitHubRawReleaseV1(BaseSource):
         self._load_images()
 
     def save(self):
-        with self._file_name.open('w') as fh:
-            json.dump(self._config, fh, indent=4)
-
-    def clean_name(self, text):
-        return name_cleaner(text)
+        json_save(self._file_name, self._config)
 
     def _load_images(self):
         self.images = {}
@@ -140,16 +156,18 @@ class GitHubRawReleaseV1(BaseSource):
 
         ## Load data from the assets.
         for asset in data['assets']:
+            name = self.clean_name(asset['name'])
             result = {
                 'name': asset['name'],
                 'size': asset['size'],
                 'url': asset['browser_download_url'],
                 }
 
-            self._data[self.clean_name(asset['name'])] = result
+            self._data[name] = result
 
-            if asset['name'].lower().endswith('.squashfs'):
-                self.utils.append(self.clean_name(asset['name']))
+            # clean_name casefolds the name already.
+            if name.endswith('.squashfs'):
+                self.utils.append(name)
 
         self._update()
 
@@ -242,9 +260,10 @@ class PortMasterV1(GitHubRawReleaseV1):
         cprint(f"- <b>{self._config['name']}</b>: Fetching info")
         # portsmd_url = "https://raw.githubusercontent.com/kloptops/PortMaster/main/ports.md"
         portsmd_url = self._data['ports.md']['url']
-        for line in fetch_text(portsmd_url).split('\n'):
+        portsmd_text = fetch_text(portsmd_url)
+        for line in portsmd_text.splitlines():
             line = line.strip()
-            if line == '':
+            if not line:
                 continue
 
             port_info = self._portsmd_to_portinfo(line)
@@ -267,7 +286,7 @@ class PortMasterV1(GitHubRawReleaseV1):
         images_md5 = fetch_text(images_url_md5).strip()
         if self._images_md5 is None or images_md5 != self._images_md5:
             logger.debug(f"images_md5={images_md5}, self.images_md5={self._images_md5}")
-            images_zip = download(self._hm.temp_dir / "images.zip", images_url_zip, images_md5, None)
+            images_zip = download(self._hm.temp_dir / f"images_{self._prefix}.zip", images_url_zip, images_md5, None)
             if images_zip is None:
                 logger.debug(f"Unable to download {images_url_zip}")
                 return
@@ -310,7 +329,8 @@ class PortMasterV1(GitHubRawReleaseV1):
             'genres': [],
             }
 
-        for key, value in re.findall(r'(?:^|\s)(\w+)=\"(.+?)"(?=\s+\w+=|$)', text.strip()):
+        for match in PORTSMD_INFO_RE.finditer(text.strip()):
+            key, value = match.group(1, 2)
             key = key.casefold()
             if key == 'title_f':
                 raw_info['reqs'].append('opengl')
@@ -324,8 +344,7 @@ class PortMasterV1(GitHubRawReleaseV1):
 
             # Zips with spaces in their names get replaced with '.'
             if '%20' in value:
-                value = value.replace('%20', '.')
-                value = value.replace('..', '.')
+                value = PORTSMD_SPACES_RE.sub('.', value)
 
             # Special keys
             if key == 'runtype':
@@ -337,7 +356,7 @@ class PortMasterV1(GitHubRawReleaseV1):
 
             raw_info[key] = value
 
-        port_info = port_info_load({})
+        port_info = port_info_empty()
 
         port_info['name'] = self.clean_name(raw_info['locat'])
         ## SUPER JANK --
@@ -371,7 +390,7 @@ class PortMasterV1(GitHubRawReleaseV1):
             ## Utils
             return zip_file
 
-        zip_info = port_info_load({})
+        zip_info = port_info_empty()
 
         zip_info['name'] = port_name
         zip_info['status'] = {
@@ -407,7 +426,6 @@ class GitHubRepoV1(GitHubRawReleaseV1):
         self._info = {}
         self.ports = []
         self.utils = []
-
         user_name = self._config['config']['user_name']
         repo_name = self._config['config']['repo_name']
         branch_name = self._config['config']['branch_name']
@@ -446,7 +464,7 @@ class GitHubRepoV1(GitHubRawReleaseV1):
             self._data[name] = result
 
             if name.endswith('.squashfs'):
-                self.utils.append(self.clean_name(asset['name']))
+                self.utils.append(name)
 
             if name == 'ports.json':
                 ports_json_file = name
@@ -489,7 +507,7 @@ class GitHubRepoV1(GitHubRawReleaseV1):
             ## Utils
             return zip_file
 
-        zip_info = port_info_load({})
+        zip_info = port_info_empty()
 
         zip_info['name'] = port_name
         zip_info['status'] = {
@@ -547,7 +565,7 @@ def raw_download(save_path, file_url, callback=None):
     if zip_file is None:
         return None
 
-    zip_info = port_info_load({})
+    zip_info = port_info_empty()
 
     zip_info['name'] = zip_file.name
     zip_info['zip_file'] = zip_file
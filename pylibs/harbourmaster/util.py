@@ -4,46 +4,110 @@ import datetime
 import functools
 import hashlib
 import json
+import os
 import platform
+import queue
 import shutil
 import re
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 
 from pathlib import Path
 
 import loguru
 import pathlib
-import requests
 import utility
 
 from loguru import logger
-from utility import cprint, cstrip
+from utility import cprint, cprint_is_buffered, cstrip
 
 from .config import *
 
+## orjson is a lot faster, but it is a compiled module so it might not be available.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 ################################################################################
 ## Utils
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+__requests_local = threading.local()
+
 def json_safe_loads(*args):
     try:
+        if orjson is not None:
+            return orjson.loads(*args)
+
         return json.loads(*args)
     except json.JSONDecodeError as err:
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
         logger.error(f"Unable to load json_data {err.doc}:{err.pos}")
         return None
 
 
-def json_safe_load(*args):
+def json_safe_load(fh):
+    return json_safe_loads(fh.read())
+
+
+def json_save(file_name, data):
+    """
+    Save data as json to file_name, uses orjson if available.
+
+    The data is written to a temporary file first and then renamed over file_name,
+    so an interrupted save can't leave a half written file behind. The existing
+    file's mode (and owner when running as root) is kept.
+    """
+    if orjson is not None:
+        json_data = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        json_data = json.dumps(data, indent=2).encode('utf-8')
+
+    temp_name = file_name.with_name(file_name.name + '.tmp')
     try:
-        return json.load(*args)
-    except json.JSONDecodeError as err:
-        logger.error(f"Unable to load json_data {err.doc}:{err.pos}")
-        return None
+        temp_name.write_bytes(json_data)
+
+        if file_name.exists():
+            shutil.copymode(file_name, temp_name)
+
+            if hasattr(os, 'geteuid') and os.geteuid() == 0:
+                file_stat = file_name.stat()
+                os.chown(temp_name, file_stat.st_uid, file_stat.st_gid)
+
+        os.replace(temp_name, file_name)
+
+    finally:
+        if temp_name.exists():
+            temp_name.unlink()
+
+
+def requests_session():
+    """
+    Returns a requests.Session for the current thread, this reuses connections between requests.
+    """
+    ## Sources can be updated from multiple threads, and requests.Session isn't thread safe.
+    session = getattr(__requests_local, 'session', None)
+
+    if session is None:
+        ## requests is slow to import, so only import it when we need it.
+        import requests
+        import requests.adapters
+
+        session = requests.Session()
+        session.headers['User-Agent'] = 'harbourmaster'
+        session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+        __requests_local.session = session
+
+    return session
 
 
 def fetch(url):
-    r = requests.get(url)
+    r = requests_session().get(url, timeout=30)
     if r.status_code != 200:
         logger.error(f"Failed to download {url!r}: {r.status_code}")
         return None
@@ -192,9 +256,18 @@ def hash_file(file_name):
     elif not isinstance(file_name, pathlib.PurePath):
         raise ValueError(file_name)
 
-    md5 = hashlib.md5()
     with file_name.open('rb') as fh:
-        md5.update(fh.read())
+        if hasattr(hashlib, 'file_digest'):
+            # Python 3.11+
+            return hashlib.file_digest(fh, 'md5').hexdigest()
+
+        md5 = hashlib.md5()
+        while True:
+            data = fh.read(DOWNLOAD_CHUNK_SIZE)
+            if len(data) == 0:
+                break
+
+            md5.update(data)
 
     return md5.hexdigest()
 
@@ -208,13 +281,15 @@ def download(file_name, file_url, md5_source=None, md5_result=None, callback=Non
     if md5_result is None:
         md5_result = [None]
 
-    r = requests.get(file_url, stream=True)
+    r = requests_session().get(file_url, stream=True, timeout=60)
 
     if r.status_code != 200:
         if callback is not None:
             callback.message_box(f"Unable to download file. [{r.status_code}]")
 
         logger.error(f"Unable to download file: {file_url!r} [{r.status_code}]")
+        # Hand the connection back to the session pool.
+        r.close()
         return None
 
     total_length = r.headers.get('content-length')
@@ -227,29 +302,68 @@ def download(file_name, file_url, md5_source=None, md5_result=None, callback=Non
 
     md5 = hashlib.md5()
 
+    ## Hash the file on a separate thread, hashlib releases the GIL so this overlaps with the network.
+    md5_queue = queue.Queue(maxsize=8)
+
+    def md5_worker():
+        while True:
+            data = md5_queue.get()
+            if data is None:
+                break
+
+            md5.update(data)
+
+    md5_thread = threading.Thread(target=md5_worker, daemon=True)
+    md5_thread.start()
+
     cprint(f"Downloading <b>{file_url!r}</b> - <b>{total_length_mb}</b>")
 
     length = 0
-    with file_name.open('wb') as fh:
-        for data in r.iter_content(chunk_size=104096, decode_unicode=False):
-            md5.update(data)
-            fh.write(data)
-            length += len(data)
+    last_amount = None
+    bar_full = '|' * 40
+    bar_empty = ' ' * 40
+    bar_unknown = '?' * 40
+    if total_length is not None:
+        bar_scale = 40 / max(total_length, 1)
 
-            if callback is not None:
-                callback.progress("Downloading file.", length, total_length)
+    ## The progress bar redraws its line in place, which only works if nothing else prints in between.
+    show_bar = not cprint_is_buffered()
 
-            if total_length is None:
-                sys.stdout.write(f"\r[{'?' * 40}] - {nice_size(length)} / {total_length_mb} ")
-            else:
-                amount = int(length / total_length * 40)
-                sys.stdout.write(f"\r[{'|' * amount}{' ' * (40 - amount)}] - {nice_size(length)} / {total_length_mb} ")
-            sys.stdout.flush()
+    try:
+        with file_name.open('wb') as fh:
+            for data in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE, decode_unicode=False):
+                md5_queue.put(data)
+                fh.write(data)
+                length += len(data)
 
-        cprint("\n")
+                if callback is not None:
+                    callback.progress("Downloading file.", length, total_length)
 
-        if callback is not None:
-            callback.progress("Downloading file.", length, total_length)
+                if not show_bar:
+                    continue
+
+                if total_length is None:
+                    sys.stdout.write(f"\r[{bar_unknown}] - {nice_size(length)} / {total_length_mb} ")
+                else:
+                    # Only redraw the progress bar when it will have visibly changed.
+                    amount = min(int(length * bar_scale), 40)
+                    if amount == last_amount and length < total_length:
+                        continue
+
+                    last_amount = amount
+                    sys.stdout.write(f"\r[{bar_full[:amount]}{bar_empty[amount:]}] - {nice_size(length)} / {total_length_mb} ")
+                sys.stdout.flush()
+
+            if show_bar:
+                cprint("\n")
+
+            if callback is not None:
+                callback.progress("Downloading file.", length, total_length)
+
+    finally:
+        md5_queue.put(None)
+        md5_thread.join()
+        r.close()
 
     md5_file = md5.hexdigest()
     if md5_source is not None:
@@ -279,15 +393,20 @@ def download(file_name, file_url, md5_source=None, md5_result=None, callback=Non
 
 
 def datetime_compare(time_a, time_b=None):
+    """
+    Returns the number of seconds from time_a to time_b, time_b defaults to now.
+    """
     if isinstance(time_a, str):
         time_a = datetime.datetime.fromisoformat(time_a)
 
     if time_b is None:
-        time_b = datetime.datetime.now()
-    elif isinstance(time_b, str):
+        return time.time() - time_a.timestamp()
+
+    if isinstance(time_b, str):
         time_b = datetime.datetime.fromisoformat(time_b)
 
-    return (time_b - time_a).seconds
+    # timedelta.seconds wraps around every day, so compare timestamps instead.
+    return time_b.timestamp() - time_a.timestamp()
 
 
 def add_list_unique(base_list, value):
@@ -380,6 +499,11 @@ def get_path_fs(path):
 
 
 def timeit(func):
+    """
+    Logs how long func takes, only if HM_PERFTEST is set in the environment.
+
+    Otherwise func is returned as is, so there is no overhead on normal runs.
+    """
     if not HM_PERFTEST:
         return func
 
@@ -432,6 +556,7 @@ __all__ = (
     'hash_file',
     'json_safe_load',
     'json_safe_loads',
+    'json_save',
     'load_pm_signature',
     'make_temp_directory',
     'name_cleaner',
@@ -1,6 +1,8 @@
 
+import contextlib
 import os
 import sys
+import threading
 
 import colorama
 from ansimarkup import AnsiMarkup, parse as ansiparse
@@ -16,6 +18,8 @@ am = AnsiMarkup(tags={
 
 __colorama = None
 __output_fh = None
+__buffer_local = threading.local()
+__buffer_lock = threading.Lock()
 
 
 def to_str(data):
@@ -55,9 +59,41 @@ def do_color(mode=None):
         __colorama = False
 
 
+@contextlib.contextmanager
+def cprint_buffered():
+    """
+    Holds back cprint output from this thread, and prints it all in one go at the end.
+    """
+    buffer = []
+    __buffer_local.buffer = buffer
+
+    try:
+        yield
+
+    finally:
+        __buffer_local.buffer = None
+
+        with __buffer_lock:
+            for args, kwargs in buffer:
+                cprint(*args, **kwargs)
+
+
+def cprint_is_buffered():
+    """
+    Is cprint output from this thread being held back?
+    """
+    return getattr(__buffer_local, 'buffer', None) is not None
+
+
 def cprint(*args, **kwargs):
     global __colorama
     global __output_fh
+
+    buffer = getattr(__buffer_local, 'buffer', None)
+    if buffer is not None:
+        buffer.append((args, kwargs))
+        return
+
     if __colorama is None:
         do_color()
 
@@ -82,6 +118,8 @@ def cstrip(arg):
 
 __all__ = (
     'cprint',
+    'cprint_buffered',
+    'cprint_is_buffered',
     'cstrip',
     'do_color',
     'in_terminal',